@@ -1,40 +1,399 @@
+import io
 import json
+import math
 import os
+import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(record):
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    _loads = orjson.loads
+else:
+    # orjson is optional; the standard library produces the same log format
+    def _dumps(record):
+        return (json.dumps(record, separators=(',', ':')) + '\n').encode()
+    _loads = json.loads
+
+# Compact the log once tombstones outnumber this fraction of live expenses
+COMPACT_RATIO = 0.25
+
+# Write buffer for the open log file
+LOG_BUFFER_SIZE = 64 * 1024
+
+# Fields the in-memory indexes rely on, with their expected types
+EXPENSE_SCHEMA = (
+    ('id', int),
+    ('amount', (int, float)),
+    ('category', str),
+    ('date', str),
+)
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+def _is_well_formed(record):
+    """
+    Check that a stored record has the structure the indexes depend on.
+    
+    Only types are checked, so records written by older versions with
+    negative amounts or free-form dates still load.
+    
+    Args:
+        record (dict): Expense entry to check
+    
+    Returns:
+        bool: True if the record can be indexed
+    """
+    if not isinstance(record, dict):
+        return False
+    for field, types in EXPENSE_SCHEMA:
+        value = record.get(field)
+        if not isinstance(value, types) or isinstance(value, bool):
+            return False
+    return True
+
+def _validate_expense(record):
+    """
+    Check a new expense before it is added.
+    
+    The schema and date pattern are built once at import, so a check is
+    a few isinstance calls and one precompiled regex match.
+    
+    Args:
+        record (dict): Expense entry to check
+    
+    Raises:
+        ValueError: If a field has the wrong type or is out of range
+    """
+    if not _is_well_formed(record):
+        raise ValueError("Invalid expense")
+    if not math.isfinite(record['amount']):
+        raise ValueError("Amount must be a finite number")
+    if record['amount'] < 0:
+        raise ValueError("Amount cannot be negative")
+    if not DATE_PATTERN.fullmatch(record['date']):
+        raise ValueError("Date must be in YYYY-MM-DD format")
+
+def _insert_by_date(dates, expenses, expense):
+    """
+    Insert an expense into a date-ordered list ahead of its same-day entries.
+    
+    Args:
+        dates (list): Dates of the expenses, in the same order
+        expenses (list): Expenses in ascending date order
+        expense (dict): Expense to insert
+    
+    Returns:
+        int: Index the expense was inserted at
+    """
+    index = bisect_left(dates, expense['date'])
+    dates.insert(index, expense['date'])
+    expenses.insert(index, expense)
+    return index
+
+def _remove_by_date(dates, expenses, expense):
+    """
+    Remove an expense from a date-ordered list.
+    
+    Bisects to the expense's date and scans only that day's entries.
+    
+    Args:
+        dates (list): Dates of the expenses, in the same order
+        expenses (list): Expenses in ascending date order
+        expense (dict): Expense to remove
+    
+    Returns:
+        int: Index the expense was removed from
+    """
+    index = bisect_left(dates, expense['date'])
+    while expenses[index] is not expense:
+        index += 1
+    del dates[index]
+    del expenses[index]
+    return index
 
 class ExpenseTracker:
-    def __init__(self, filename='expenses.json'):
+    def __init__(self, filename='expenses.json', flush_every=1):
         """
         Initialize the expense tracker with a JSON file for persistent storage.
         
         Args:
             filename (str): Name of the file to store expenses
+            flush_every (int, optional): Number of log records to buffer before
+                flushing them to the file; 1 writes every change through at once
         """
         self.filename = filename
+        self.flush_every = flush_every
+        self._log_file = None
+        self._unflushed = 0
+        self._tombstones = 0
+        self._legacy_format = False
+        self._needs_newline = False
+        # Raw log lines that could not be read; kept so compact() never drops them
+        self._unreadable = []
         self.expenses = self.load_expenses()
-        self.categories = self.get_unique_categories()
+        # Expenses are kept in ascending date order with same-day entries
+        # newest first, so reading the list backwards gives the newest-first
+        # listing with same-day entries in the order they were added
+        self.expenses.reverse()
+        self.expenses.sort(key=itemgetter('date'))
+        self._dates = [expense['date'] for expense in self.expenses]
+        # Amounts and category codes are stored column-wise alongside
+        # _dates so totals and reports don't have to touch the dicts
+        self._category_codes = {}
+        self._amounts = array('d', (expense['amount'] for expense in self.expenses))
+        self._codes = array('l', (self._category_code(expense['category']) for expense in self.expenses))
+        self._by_id = {expense['id']: expense for expense in self.expenses}
+        # Lowercased category -> (dates, expenses) in the same order as self.expenses
+        self._by_category = {}
+        for expense in self.expenses:
+            dates, expenses = self._by_category.setdefault(expense['_cat_lc'], ([], []))
+            dates.append(expense['date'])
+            expenses.append(expense)
+        self._next_id = max((expense['id'] for expense in self.expenses), default=0) + 1
+        self.categories = Counter(expense['category'] for expense in self.expenses)
+        if self._legacy_format:
+            self.compact()
+    
+    def _category_code(self, category):
+        """
+        Get the integer code for a category, assigning a new one if needed.
+        
+        Args:
+            category (str): Category of an expense
+        
+        Returns:
+            int: Code used for the category in the column arrays
+        """
+        return self._category_codes.setdefault(category, len(self._category_codes))
     
     def load_expenses(self):
         """
-        Load expenses from JSON file or create a new list if file doesn't exist.
+        Load expenses from the JSON-Lines log or create a new list if file doesn't exist.
+        
+        Each line is either an expense record or a tombstone of the form
+        {"del": id}. Records are replayed in order, so later lines win.
+        Files in the old single-array format are still read and get
+        rewritten as JSON Lines on startup. An old-format file that cannot
+        be parsed is moved aside to <filename>.corrupt and a new log is
+        started, so new expenses are never appended to a broken array.
         
         Returns:
             list: List of expense entries
         """
-        if os.path.exists(self.filename):
+        if not os.path.exists(self.filename):
+            return []
+        
+        corrupt = False
+        try:
+            with open(self.filename, 'rb') as file:
+                if file.read(1) == b'[':
+                    file.seek(0)
+                    content = file.read()
+                    try:
+                        records = _loads(content)
+                    except ValueError:
+                        if self._starts_with_log_line(content):
+                            # A log whose first line happens to be an array
+                            expenses = self._replay_log(io.BytesIO(content))
+                        else:
+                            corrupt = True
+                            expenses = []
+                    else:
+                        self._legacy_format = True
+                        expenses = self._renumber_duplicates(self._load_legacy(records))
+                else:
+                    file.seek(0)
+                    expenses = self._replay_log(file)
+        # ValueError covers JSONDecodeError and UnicodeDecodeError
+        except (ValueError, IOError):
+            return []
+        
+        if corrupt:
+            corrupt_filename = self.filename + '.corrupt'
+            suffix = 1
+            while os.path.exists(corrupt_filename):
+                corrupt_filename = f"{self.filename}.corrupt.{suffix}"
+                suffix += 1
+            os.replace(self.filename, corrupt_filename)
+            print(f"Could not read {self.filename}; moved it to {corrupt_filename} and started a new log.")
+        
+        for expense in expenses:
+            expense['_cat_lc'] = expense['category'].lower()
+        return expenses
+    
+    @staticmethod
+    def _starts_with_log_line(content):
+        """
+        Check whether file content starts with a complete JSON-Lines record.
+        
+        A log line holds one whole JSON value, while a pretty-printed or
+        truncated old-format array does not close on its first line.
+        
+        Args:
+            content (bytes): Raw file content
+        
+        Returns:
+            bool: True if the first line parses on its own
+        """
+        try:
+            _loads(content.split(b'\n', 1)[0])
+        except ValueError:
+            return False
+        return True
+    
+    def _replay_log(self, file):
+        """
+        Replay the lines of a JSON-Lines log into the live expenses.
+        
+        Args:
+            file (file): Log opened in binary mode
+        
+        Returns:
+            list: Live expense entries in the order they were first logged
+        """
+        by_id = {}
+        for line in file:
+            # A torn last line has no newline; the next append must start a new one
+            self._needs_newline = not line.endswith(b'\n')
+            line = line.strip()
+            if not line:
+                continue
             try:
-                with open(self.filename, 'r') as file:
-                    return json.load(file)
-            except (json.JSONDecodeError, IOError):
-                return []
-        return []
+                record = _loads(line)
+            except ValueError:
+                # A torn or corrupt line, possibly cut mid-character; keep it but don't load it
+                self._unreadable.append(line)
+                continue
+            if isinstance(record, dict) and 'del' in record:
+                if isinstance(record['del'], int) and not isinstance(record['del'], bool):
+                    by_id.pop(record['del'], None)
+                    self._tombstones += 1
+                else:
+                    self._unreadable.append(line)
+                continue
+            if not _is_well_formed(record):
+                self._unreadable.append(line)
+                continue
+            by_id[record['id']] = record
+        return list(by_id.values())
+    
+    def _load_legacy(self, records):
+        """
+        Clean up expenses read from the old single-array file format.
+        
+        Entries that cannot be indexed are not loaded, but are kept so the
+        converted log still contains them.
+        
+        Args:
+            records (list): Entries decoded from the file
+        
+        Returns:
+            list: Well-formed expense entries
+        """
+        expenses = []
+        for record in records if isinstance(records, list) else []:
+            if _is_well_formed(record):
+                expenses.append(record)
+            else:
+                self._unreadable.append(json.dumps(record).encode())
+        return expenses
+    
+    @staticmethod
+    def _renumber_duplicates(expenses):
+        """
+        Give fresh ids to expenses whose id is already taken.
+        
+        Older versions numbered expenses as len + 1, so an id could be
+        reused after a deletion. The JSON-Lines log is keyed by id, so
+        duplicates must be renumbered before an old file is converted or
+        they would be lost on the next load.
+        
+        Args:
+            expenses (list): Expense entries from the old file format
+        
+        Returns:
+            list: The same entries with unique ids
+        """
+        seen = set()
+        next_id = max((expense['id'] for expense in expenses), default=0) + 1
+        for expense in expenses:
+            if expense['id'] in seen:
+                expense['id'] = next_id
+                next_id += 1
+            seen.add(expense['id'])
+        return expenses
+    
+    def _append_record(self, record):
+        """
+        Append a single record to the JSON-Lines log.
+        
+        Args:
+            record (dict): Expense entry or deletion tombstone
+        """
+        # The log stays open between writes; it is opened on first use
+        if self._log_file is None:
+            self._log_file = open(self.filename, 'ab', buffering=LOG_BUFFER_SIZE)
+            if self._needs_newline:
+                self._log_file.write(b'\n')
+                self._needs_newline = False
+        self._log_file.write(self._serialize(record))
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self._log_file.flush()
+            self._unflushed = 0
     
-    def save_expenses(self):
+    def close(self):
         """
-        Save expenses to JSON file.
+        Flush any buffered log records and close the log file.
         """
-        with open(self.filename, 'w') as file:
-            json.dump(self.expenses, file, indent=4)
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+            self._unflushed = 0
+    
+    @staticmethod
+    def _serialize(record):
+        """
+        Serialize a record as one log line, leaving out cached fields.
+        
+        Args:
+            record (dict): Expense entry or deletion tombstone
+        
+        Returns:
+            bytes: Compact JSON terminated by a newline
+        """
+        return _dumps({key: value for key, value in record.items() if not key.startswith('_')})
+    
+    def compact(self):
+        """
+        Rewrite the log with only the live expenses, dropping tombstones.
+        
+        Lines that could not be read at load time are copied over unchanged.
+        The new log is written to a temporary file first and then swapped
+        in with os.replace, so a crash never leaves a half-written file.
+        """
+        # The open handle would keep pointing at the replaced file
+        self.close()
+        tmp_filename = self.filename + '.tmp'
+        with open(tmp_filename, 'wb') as file:
+            for expense in reversed(self.expenses):
+                file.write(self._serialize(expense))
+            # Kept after the live records so the log never starts with one
+            for line in self._unreadable:
+                file.write(line + b'\n')
+        os.replace(tmp_filename, self.filename)
+        self._tombstones = 0
+        self._needs_newline = False
     
     def add_expense(self, amount, category, description, date=None):
         """
@@ -50,16 +409,23 @@ class ExpenseTracker:
             date = datetime.now().strftime('%Y-%m-%d')
         
         expense = {
-            'id': len(self.expenses) + 1,
+            'id': self._next_id,
             'amount': round(float(amount), 2),
             'category': category.strip().capitalize(),
             'description': description.strip(),
             'date': date
         }
+        _validate_expense(expense)
+        expense['_cat_lc'] = expense['category'].lower()
         
-        self.expenses.append(expense)
-        self.save_expenses()
-        self.categories = self.get_unique_categories()
+        index = _insert_by_date(self._dates, self.expenses, expense)
+        self._amounts.insert(index, expense['amount'])
+        self._codes.insert(index, self._category_code(expense['category']))
+        self._by_id[expense['id']] = expense
+        _insert_by_date(*self._by_category.setdefault(expense['_cat_lc'], ([], [])), expense)
+        self._next_id += 1
+        self._append_record(expense)
+        self.categories[expense['category']] += 1
         print(f"Expense of ${amount} in {category} added successfully!")
     
     def get_unique_categories(self):
@@ -69,7 +435,63 @@ class ExpenseTracker:
         Returns:
             set: Unique expense categories
         """
-        return set(expense['category'] for expense in self.expenses)
+        return set(self.categories.keys())
+    
+    def _date_range(self, start_date=None, end_date=None, dates=None):
+        """
+        Find the slice of a date-ordered expense list within a date range.
+        
+        Args:
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+            dates (list, optional): Dates to search, defaulting to all expenses
+        
+        Returns:
+            tuple: Start and end index of the matching expenses
+        """
+        if dates is None:
+            dates = self._dates
+        low = bisect_left(dates, start_date) if start_date else 0
+        high = bisect_right(dates, end_date) if end_date else len(dates)
+        return low, high
+    
+    def _column_range(self, column, start_date=None, end_date=None):
+        """
+        Get the part of a column array that falls within a date range.
+        
+        An unbounded range returns the column itself rather than a copy.
+        
+        Args:
+            column (array): Column aligned with self.expenses
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+        
+        Returns:
+            array: Matching values in ascending date order
+        """
+        if not start_date and not end_date:
+            return column
+        low, high = self._date_range(start_date, end_date)
+        return column[low:high]
+    
+    def _category_slice(self, category, start_date=None, end_date=None):
+        """
+        Get one category's expenses within a date range, oldest first.
+        
+        Args:
+            category (str): Lowercased category
+            start_date (str, optional): Start date in YYYY-MM-DD format
+            end_date (str, optional): End date in YYYY-MM-DD format
+        
+        Returns:
+            list: Matching expenses in ascending date order
+        """
+        bucket = self._by_category.get(category)
+        if bucket is None:
+            return []
+        dates, expenses = bucket
+        low, high = self._date_range(start_date, end_date, dates)
+        return expenses[low:high]
     
     def view_expenses(self, filter_category=None, start_date=None, end_date=None):
         """
@@ -83,27 +505,16 @@ class ExpenseTracker:
         Returns:
             list: Filtered list of expenses
         """
-        filtered_expenses = self.expenses.copy()
-        
-        if filter_category:
-            filtered_expenses = [
-                expense for expense in filtered_expenses 
-                if expense['category'].lower() == filter_category.lower()
-            ]
+        category = filter_category.lower() if filter_category else None
         
-        if start_date:
-            filtered_expenses = [
-                expense for expense in filtered_expenses 
-                if expense['date'] >= start_date
-            ]
+        if category is None:
+            low, high = self._date_range(start_date, end_date)
+            filtered_expenses = self.expenses[low:high]
+        else:
+            filtered_expenses = self._category_slice(category, start_date, end_date)
         
-        if end_date:
-            filtered_expenses = [
-                expense for expense in filtered_expenses 
-                if expense['date'] <= end_date
-            ]
-        
-        return sorted(filtered_expenses, key=lambda x: x['date'], reverse=True)
+        filtered_expenses.reverse()
+        return filtered_expenses
     
     def calculate_total_expenses(self, filter_category=None, start_date=None, end_date=None):
         """
@@ -117,8 +528,12 @@ class ExpenseTracker:
         Returns:
             float: Total expenses
         """
-        filtered_expenses = self.view_expenses(filter_category, start_date, end_date)
-        return round(sum(expense['amount'] for expense in filtered_expenses), 2)
+        # Sum newest first, the same order view_expenses lists them in
+        if filter_category:
+            expenses = self._category_slice(filter_category.lower(), start_date, end_date)
+            return round(sum(expense['amount'] for expense in reversed(expenses)), 2)
+        
+        return round(sum(reversed(self._column_range(self._amounts, start_date, end_date))), 2)
     
     def generate_expense_report(self, start_date=None, end_date=None):
         """
@@ -131,15 +546,19 @@ class ExpenseTracker:
         Returns:
             dict: Expense report with total spending per category
         """
-        filtered_expenses = self.view_expenses(start_date=start_date, end_date=end_date)
+        amounts = self._column_range(self._amounts, start_date, end_date)
+        codes = self._column_range(self._codes, start_date, end_date)
         
-        report = {}
-        for expense in filtered_expenses:
-            category = expense['category']
-            amount = expense['amount']
-            report[category] = report.get(category, 0) + amount
+        # Walk newest first so categories with equal totals keep the same
+        # order as before. A plain zip loop over the typed columns is the
+        # fastest grouping available without a compiler; per-code
+        # compress()/sum() passes and list accumulators measured no faster
+        totals = defaultdict(float)
+        for code, amount in zip(reversed(codes), reversed(amounts)):
+            totals[code] += amount
         
-        return {k: round(v, 2) for k, v in sorted(report.items(), key=lambda x: x[1], reverse=True)}
+        names = list(self._category_codes)
+        return {names[k]: round(v, 2) for k, v in sorted(totals.items(), key=itemgetter(1), reverse=True)}
     
     def delete_expense(self, expense_id):
         """
@@ -148,14 +567,27 @@ class ExpenseTracker:
         Args:
             expense_id (int): ID of the expense to delete
         """
-        for index, expense in enumerate(self.expenses):
-            if expense['id'] == expense_id:
-                del self.expenses[index]
-                self.save_expenses()
-                print(f"Expense with ID {expense_id} deleted successfully!")
-                return
+        expense = self._by_id.pop(expense_id, None)
+        if expense is None:
+            print(f"No expense found with ID {expense_id}")
+            return
         
-        print(f"No expense found with ID {expense_id}")
+        index = _remove_by_date(self._dates, self.expenses, expense)
+        del self._amounts[index]
+        del self._codes[index]
+        bucket = self._by_category[expense['_cat_lc']]
+        _remove_by_date(*bucket, expense)
+        if not bucket[1]:
+            del self._by_category[expense['_cat_lc']]
+        
+        self.categories[expense['category']] -= 1
+        if not self.categories[expense['category']]:
+            del self.categories[expense['category']]
+        self._append_record({'del': expense_id})
+        self._tombstones += 1
+        if self._tombstones > len(self.expenses) * COMPACT_RATIO:
+            self.compact()
+        print(f"Expense with ID {expense_id} deleted successfully!")
     
     def print_expenses(self, expenses):
         """
@@ -168,17 +600,24 @@ class ExpenseTracker:
             print("No expenses found.")
             return
         
-        print("\n{:<5} {:<15} {:<15} {:<20} {:<10}".format("ID", "Amount", "Category", "Description", "Date"))
-        print("-" * 65)
-        
-        for expense in expenses:
-            print("{:<5} ${:<14.2f} {:<15} {:<20} {}".format(
+        # Build the whole table first and write it out in one call
+        row = "{:<5} ${:<14.2f} {:<15} {:<20} {}".format
+        lines = [
+            "",
+            "{:<5} {:<15} {:<15} {:<20} {:<10}".format("ID", "Amount", "Category", "Description", "Date"),
+            "-" * 65
+        ]
+        lines.extend(
+            row(
                 expense['id'], 
                 expense['amount'], 
                 expense['category'], 
                 expense['description'][:20], 
                 expense['date']
-            ))
+            )
+            for expense in expenses
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
     tracker = ExpenseTracker()
@@ -241,6 +680,7 @@ def main():
                 tracker.delete_expense(expense_id)
             
             elif choice == '8':
+                tracker.close()
                 print("Thank you for using Expense Tracker. Goodbye!")
                 break
             